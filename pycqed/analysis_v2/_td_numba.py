@@ -0,0 +1,85 @@
+"""
+Numba compiled kernels used by the time domain analyses to normalize data
+to the calibration points.
+
+numba is an optional dependency. If it cannot be imported NUMBA_AVAILABLE
+is False and the analyses fall back on the implementation in the
+analysis_toolbox.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kw):
+        # Allows the kernels below to be defined (but not compiled) when
+        # numba is not installed.
+        return lambda fn: fn
+
+
+@njit(cache=True, fastmath=True)
+def _mean_at(y, idx):
+    """
+    Mean of y at the indices idx, negative indices count from the end.
+    """
+    n = y.shape[0]
+    total = 0.
+    for k in range(idx.shape[0]):
+        i = idx[k]
+        if i < 0:
+            i += n
+        total += y[i]
+    return total / idx.shape[0]
+
+
+@njit(cache=True, fastmath=True)
+def _normalize_v3(y, zidx, oidx):
+    """
+    Equivalent of a_tools.normalize_data_v3 in a single pass over y.
+
+    Args:
+        y (float64 array)   : 1D dataset that has to be normalized
+        zidx (int64 array)  : indices in y that correspond to zero
+        oidx (int64 array)  : indices in y that correspond to one
+    """
+    z0 = _mean_at(y, zidx)
+    scale = 1. / (_mean_at(y, oidx) - z0)
+    out = np.empty(y.shape[0])
+    for i in range(y.shape[0]):
+        out[i] = (y[i] - z0) * scale
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def _rotate_and_normalize(iq, zidx, oidx):
+    """
+    Equivalent of a_tools.rotate_and_normalize_data for the case where the
+    zero and one coordinates are determined from the calibration points.
+
+    Args:
+        iq (float64 array)  : 2xN array containing the I and Q quadratures
+        zidx (int64 array)  : indices in iq that correspond to zero
+        oidx (int64 array)  : indices in iq that correspond to one
+
+    Returns:
+        normalized_data, I_zero, Q_zero, I_one, Q_one
+    """
+    I = iq[0]
+    Q = iq[1]
+    I_zero = _mean_at(I, zidx)
+    Q_zero = _mean_at(Q, zidx)
+    I_one = _mean_at(I, oidx)
+    Q_one = _mean_at(Q, oidx)
+
+    # Projecting on the axis through the calibration points and dividing
+    # by their distance is the same as rotating and normalizing.
+    dI = I_one - I_zero
+    dQ = Q_one - Q_zero
+    scale = 1. / (dI * dI + dQ * dQ)
+    out = np.empty(I.shape[0])
+    for i in range(I.shape[0]):
+        out[i] = ((I[i] - I_zero) * dI + (Q[i] - Q_zero) * dQ) * scale
+    return out, I_zero, Q_zero, I_one, Q_one
@@ -11,6 +11,60 @@ from pycqed.utilities.general import format_value_string
 from copy import deepcopy
 from pycqed.analysis.tools.data_manipulation import \
     populations_using_rate_equations
+from pycqed.analysis_v2._td_numba import (
+    NUMBA_AVAILABLE, _normalize_v3, _rotate_and_normalize)
+
+
+def _normalize_fast(y, zidx, oidx):
+    """
+    Equivalent of a_tools.normalize_data_v3 that translates and scales the
+    data in place in a single output buffer instead of creating
+    intermediate arrays.
+
+    Args:
+        y (array)       : 1D dataset that has to be normalized
+        zidx (array)    : indices in y that correspond to zero
+        oidx (array)    : indices in y that correspond to one
+    """
+    z0 = y[zidx].mean()
+    o1 = y[oidx].mean()
+    out = np.subtract(y, z0)
+    np.multiply(out, 1. / (o1 - z0), out=out)
+    return out
+
+
+def _rotate_and_normalize_fast(iq, zidx, oidx):
+    """
+    Equivalent of a_tools.rotate_and_normalize_data for the case where the
+    zero and one coordinates are determined from the calibration points.
+
+    Instead of translating, rotating and normalizing in separate steps the
+    data is projected on the axis through the calibration points using a
+    single matrix-vector product.
+
+    Args:
+        iq (array)      : 2xN array containing the I and Q quadratures
+        zidx (array)    : indices in iq that correspond to zero
+        oidx (array)    : indices in iq that correspond to one
+    Returns:
+        normalized_data, zero_coord, one_coord
+    """
+    zero_coord = iq[:, zidx].mean(axis=1)
+    one_coord = iq[:, oidx].mean(axis=1)
+    axis = one_coord - zero_coord
+    axis /= np.dot(axis, axis)
+    normalized_data = np.dot(axis, iq)
+    normalized_data -= np.dot(axis, zero_coord)
+    return normalized_data, tuple(zero_coord), tuple(one_coord)
+
+
+def _cal_point_indices(cal_points):
+    """
+    Converts the zero and one cal_points to the int64 index arrays used by
+    the normalization kernels above, entries that are None stay None.
+    """
+    return tuple(None if pts is None else np.asarray(pts, dtype=np.int64)
+                 for pts in cal_points[:2])
 
 
 class Single_Qubit_TimeDomainAnalysis(ba.BaseDataAnalysis):
@@ -29,28 +83,49 @@ class Single_Qubit_TimeDomainAnalysis(ba.BaseDataAnalysis):
 
             zero_coord, one_coord
         '''
-
         cal_points = self.options_dict.get('cal_points', None)
         zero_coord = self.options_dict.get('zero_coord', None)
         one_coord = self.options_dict.get('one_coord', None)
 
-
         # FIXME THIS IS A HACK related to recent issue
         self.data_dict = self.raw_data_dict
         if cal_points is None:
             # default for all standard Timedomain experiments
             cal_points = [list(range(-4, -2)), list(range(-2, 0))]
+        zidx, oidx = _cal_point_indices(cal_points)
+        # the fast kernels require both the zero and one cal points
+        fast = zidx is not None and oidx is not None
 
-        if len(self.raw_data_dict['measured_values']) == 1:
+        measured_values = self.raw_data_dict['measured_values']
+        if len(measured_values) == 1 and fast:
             # if only one weight function is used rotation is not required
+            if NUMBA_AVAILABLE:
+                self.proc_data_dict['corr_data'] = _normalize_v3(
+                    np.asarray(measured_values[0], dtype=np.float64),
+                    zidx, oidx)
+            else:
+                self.proc_data_dict['corr_data'] = _normalize_fast(
+                    np.asarray(measured_values[0], dtype=np.float64),
+                    zidx, oidx)
+        elif len(measured_values) == 1:
             self.proc_data_dict['corr_data'] = a_tools.normalize_data_v3(
-                self.raw_data_dict['measured_values'][0],
+                measured_values[0],
                 cal_zero_points=cal_points[0],
                 cal_one_points=cal_points[1])
+        elif zero_coord is None and one_coord is None and fast:
+            iq = np.asarray(measured_values[0:2], dtype=np.float64)
+            if NUMBA_AVAILABLE:
+                self.proc_data_dict['corr_data'], I_zero, Q_zero, \
+                    I_one, Q_one = _rotate_and_normalize(iq, zidx, oidx)
+                zero_coord = (I_zero, Q_zero)
+                one_coord = (I_one, Q_one)
+            else:
+                self.proc_data_dict['corr_data'], zero_coord, one_coord = \
+                    _rotate_and_normalize_fast(iq, zidx, oidx)
         else:
             self.proc_data_dict['corr_data'], zero_coord, one_coord = \
                 a_tools.rotate_and_normalize_data(
-                    data=self.raw_data_dict['measured_values'][0:2],
+                    data=measured_values[0:2],
                     zero_coord=zero_coord,
                     one_coord=one_coord,
                     cal_zero_points=cal_points[0],
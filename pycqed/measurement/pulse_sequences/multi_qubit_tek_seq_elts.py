@@ -1,26 +1,82 @@
 import logging
+import os
 import itertools
+from functools import reduce
 import numpy as np
+from scipy import signal
 from copy import deepcopy
-from pycqed.measurement.waveform_control import element
-from pycqed.measurement.waveform_control import pulse
 from pycqed.measurement.waveform_control import sequence
-from pycqed.utilities.general import add_suffix_to_dict_keys
+from pycqed.utilities.general import add_suffix_to_dict_keys, LRUCache
 from pycqed.measurement.pulse_sequences.standard_elements import multi_pulse_elt
 from pycqed.measurement.pulse_sequences.standard_elements import distort_and_compensate
+from pycqed.measurement.pulse_sequences.standard_elements import \
+    clear_kernel_rfft_cache
 
 from pycqed.measurement.pulse_sequences.single_qubit_tek_seq_elts import get_pulse_dict_from_pars
-from importlib import reload
-reload(pulse)
-from ..waveform_control import pulse_library
-reload(pulse_library)
 
 station = None
-reload(element)
 kernel_dir = 'kernels/'
 # You need to explicitly set this before running any functions from this module
 # I guess there are cleaner solutions :)
 cached_kernels = {}
+# (kernels, combined kernel) by the tuple of kernel names, see
+# preload_kernels_func
+cached_combined_kernels = {}
+
+
+def _off_on_combinations(n):
+    '''
+    Returns all combinations of I and X180 pulses on n qubits followed by
+    a readout, q0 is flipped in every other combination.
+    '''
+    return [['X180 q{}'.format(k) if (i >> k) & 1 else 'I q{}'.format(k)
+             for k in range(n)] + ['RO'] for i in range(2**n)]
+
+
+# pulse combinations used by the two to five qubit off-on sequences
+_OFFON_COMBS = {n: _off_on_combinations(n) for n in (2, 3, 4, 5)}
+
+# calibration points of the two qubit tomography and cphase sequences
+_CAL_POINTS_2Q_TOMO = ((('I q0', 'I q1', 'RO'),)*7 +
+                       (('X180 q0', 'I q1', 'RO'),)*7 +
+                       (('I q0', 'X180 q1', 'RO'),)*7 +
+                       (('X180 q0', 'X180 q1', 'RO'),)*7)
+_CAL_POINTS_CPHASE = ((('I q0', 'I q1', 'RO'),)*2 +
+                      (('X180 q0', 'I q1', 'RO'),)*2 +
+                      (('I q0', 'X180 q1', 'RO'),)*2 +
+                      (('X180 q0', 'X180 q1', 'RO'),)*2)
+
+# (pulse_pars, copy of pulse_pars, pulses) by id of pulse_pars, used by
+# _get_pulse_dict_cached. Only the most recently used entries are kept.
+_pulse_dict_cache = LRUCache(8)
+
+
+def _pars_equal(pars_a, pars_b):
+    '''
+    Returns True if pars_a == pars_b. Parameters that cannot be compared
+    with a single truth value (e.g. numpy arrays) count as not equal.
+    '''
+    try:
+        return bool(pars_a == pars_b)
+    except ValueError:
+        return False
+
+
+def _get_pulse_dict_cached(pulse_pars):
+    '''
+    Memoized get_pulse_dict_from_pars for pulse_pars dicts that are passed
+    to the sequences repeatedly. A cached result is only used if it was
+    created for the same pulse_pars object and its contents have not
+    changed since. Every call returns new pulse dicts, so these can still
+    be edited by the sequences.
+    '''
+    entry = _pulse_dict_cache.get(id(pulse_pars))
+    if (entry is None or entry[0] is not pulse_pars or
+            not _pars_equal(entry[1], pulse_pars)):
+        entry = (pulse_pars, deepcopy(pulse_pars),
+                 get_pulse_dict_from_pars(pulse_pars))
+        _pulse_dict_cache[id(pulse_pars)] = entry
+    return {name: dict(pars) for name, pars in entry[2].items()}
 
 
 def avoided_crossing_spec_seq(operation_dict, q0, q1, RO_target,
@@ -35,9 +91,7 @@ def avoided_crossing_spec_seq(operation_dict, q0, q1, RO_target,
 
     # N.B. Identities not needed in all cases
     pulse_combinations = ['X180 '+q0, 'SpecPulse '+q1, 'RO '+RO_target]
-    pulses = []
-    for p in pulse_combinations:
-        pulses += [operation_dict[p]]
+    pulses = [operation_dict[p] for p in pulse_combinations]
     el = multi_pulse_elt(0, station, pulses, sequencer_config)
     el_list.append(el)
     seq.append_element(el, trigger_wait=True)
@@ -46,39 +100,30 @@ def avoided_crossing_spec_seq(operation_dict, q0, q1, RO_target,
     return seq, el_list
 
 
-def two_qubit_off_on(q0_pulse_pars, q1_pulse_pars, RO_pars,
-                     return_seq=False, verbose=False):
-
-    seq_name = '2_qubit_OffOn_sequence'
+def _off_on_seq(pulse_pars_list, RO_pars, return_seq=False, verbose=False):
+    '''
+    Off-on sequence on the qubits with the pulse parameters in
+    pulse_pars_list, the pulses of the k-th qubit are labeled 'qk'.
+    Shared by the two to five qubit off-on sequences.
+    '''
+    n = len(pulse_pars_list)
+    seq_name = '{}_qubit_OffOn_sequence'.format(n)
     seq = sequence.Sequence(seq_name)
     station.pulsar.update_channel_settings()
     el_list = []
     # Create a dict with the parameters for all the pulses
-    q0_pulses = add_suffix_to_dict_keys(
-        get_pulse_dict_from_pars(q0_pulse_pars), ' q0')
-    q1_pulses = add_suffix_to_dict_keys(
-        get_pulse_dict_from_pars(q1_pulse_pars), ' q1')
-    RO_dict = {'RO': RO_pars}
-
-    pulse_dict = {}
-    pulse_dict.update(q0_pulses)
-    pulse_dict.update(q1_pulses)
-    pulse_dict.update(RO_dict)
+    pulse_dict = {'RO': RO_pars}
+    for k, pulse_pars in enumerate(pulse_pars_list):
+        pulse_dict.update(add_suffix_to_dict_keys(
+            _get_pulse_dict_cached(pulse_pars), ' q{}'.format(k)))
 
     # N.B. Identities not needed in all cases
-    pulse_combinations = [['I q0', 'I q1', 'RO'],
-                          ['X180 q0', 'I q1', 'RO'],
-                          ['I q0', 'X180 q1', 'RO'],
-                          ['X180 q0', 'X180 q1', 'RO']]
-
-    for i, pulse_comb in enumerate(pulse_combinations):
-        pulses = []
-        for p in pulse_comb:
-            pulses += [pulse_dict[p]]
+    for i, pulse_comb in enumerate(_OFFON_COMBS[n]):
+        pulses = [pulse_dict[p] for p in pulse_comb]
 
         el = multi_pulse_elt(i, station, pulses)
         el_list.append(el)
-        seq.append_element(el, trigger_wait=True)
+    seq.extend_elements(el_list, trigger_wait=True)
     station.pulsar.program_awgs(seq, *el_list, verbose=verbose)
     if return_seq:
         return seq, el_list
@@ -86,51 +131,16 @@ def two_qubit_off_on(q0_pulse_pars, q1_pulse_pars, RO_pars,
         return seq_name
 
 
-def three_qubit_off_on(q0_pulse_pars, q1_pulse_pars, q2_pulse_pars, RO_pars,
-                       return_seq=False, verbose=False):
-
-    seq_name = '3_qubit_OffOn_sequence'
-    seq = sequence.Sequence(seq_name)
-    station.pulsar.update_channel_settings()
-    el_list = []
-    # Create a dict with the parameters for all the pulses
-    q0_pulses = add_suffix_to_dict_keys(
-        get_pulse_dict_from_pars(q0_pulse_pars), ' q0')
-    q1_pulses = add_suffix_to_dict_keys(
-        get_pulse_dict_from_pars(q1_pulse_pars), ' q1')
-    q2_pulses = add_suffix_to_dict_keys(
-        get_pulse_dict_from_pars(q2_pulse_pars), ' q2')
-    RO_dict = {'RO': RO_pars}
-
-    pulse_dict = {}
-    pulse_dict.update(q0_pulses)
-    pulse_dict.update(q1_pulses)
-    pulse_dict.update(q2_pulses)
-    pulse_dict.update(RO_dict)
-
-    # N.B. Identities not needed in all cases
-    pulse_combinations = [['I q0', 'I q1', 'I q2', 'RO'],
-                          ['X180 q0', 'I q1', 'I q2', 'RO'],
-                          ['I q0', 'X180 q1', 'I q2', 'RO'],
-                          ['X180 q0', 'X180 q1', 'I q2', 'RO'],
-                          ['I q0', 'I q1', 'X180 q2', 'RO'],
-                          ['X180 q0', 'I q1', 'X180 q2', 'RO'],
-                          ['I q0', 'X180 q1', 'X180 q2', 'RO'],
-                          ['X180 q0', 'X180 q1', 'X180 q2', 'RO']]
+def two_qubit_off_on(q0_pulse_pars, q1_pulse_pars, RO_pars,
+                     return_seq=False, verbose=False):
+    return _off_on_seq([q0_pulse_pars, q1_pulse_pars], RO_pars,
+                       return_seq=return_seq, verbose=verbose)
 
-    for i, pulse_comb in enumerate(pulse_combinations):
-        pulses = []
-        for p in pulse_comb:
-            pulses += [pulse_dict[p]]
 
-        el = multi_pulse_elt(i, station, pulses)
-        el_list.append(el)
-        seq.append_element(el, trigger_wait=True)
-    station.pulsar.program_awgs(seq, *el_list, verbose=verbose)
-    if return_seq:
-        return seq, el_list
-    else:
-        return seq_name
+def three_qubit_off_on(q0_pulse_pars, q1_pulse_pars, q2_pulse_pars, RO_pars,
+                       return_seq=False, verbose=False):
+    return _off_on_seq([q0_pulse_pars, q1_pulse_pars, q2_pulse_pars],
+                       RO_pars, return_seq=return_seq, verbose=verbose)
 
 
 def four_qubit_off_on(q0_pulse_pars,
@@ -139,60 +149,9 @@ def four_qubit_off_on(q0_pulse_pars,
                       q3_pulse_pars,
                       RO_pars,
                       return_seq=False, verbose=False):
-
-    seq_name = '4_qubit_OffOn_sequence'
-    seq = sequence.Sequence(seq_name)
-    station.pulsar.update_channel_settings()
-    el_list = []
-    # Create a dict with the parameters for all the pulses
-    q0_pulses = add_suffix_to_dict_keys(
-        get_pulse_dict_from_pars(q0_pulse_pars), ' q0')
-    q1_pulses = add_suffix_to_dict_keys(
-        get_pulse_dict_from_pars(q1_pulse_pars), ' q1')
-    q2_pulses = add_suffix_to_dict_keys(
-        get_pulse_dict_from_pars(q2_pulse_pars), ' q2')
-    q3_pulses = add_suffix_to_dict_keys(
-        get_pulse_dict_from_pars(q3_pulse_pars), ' q3')
-    RO_dict = {'RO': RO_pars}
-
-    pulse_dict = {}
-    pulse_dict.update(q0_pulses)
-    pulse_dict.update(q1_pulses)
-    pulse_dict.update(q2_pulses)
-    pulse_dict.update(q3_pulses)
-    pulse_dict.update(RO_dict)
-
-    # N.B. Identities not needed in all cases
-    pulse_combinations = [['I q0', 'I q1', 'I q2', 'I q3', 'RO'],
-                          ['X180 q0', 'I q1', 'I q2', 'I q3', 'RO'],
-                          ['I q0', 'X180 q1', 'I q2', 'I q3', 'RO'],
-                          ['X180 q0', 'X180 q1', 'I q2', 'I q3', 'RO'],
-                          ['I q0', 'I q1', 'X180 q2', 'I q3', 'RO'],
-                          ['X180 q0', 'I q1', 'X180 q2', 'I q3', 'RO'],
-                          ['I q0', 'X180 q1', 'X180 q2',  'I q3', 'RO'],
-                          ['X180 q0', 'X180 q1', 'X180 q2',  'I q3', 'RO'],
-                          ['I q0', 'I q1', 'I q2', 'X180 q3', 'RO'],
-                          ['X180 q0', 'I q1', 'I q2', 'X180 q3', 'RO'],
-                          ['I q0', 'X180 q1', 'I q2', 'X180 q3', 'RO'],
-                          ['X180 q0', 'X180 q1', 'I q2', 'X180 q3', 'RO'],
-                          ['I q0', 'I q1', 'X180 q2', 'X180 q3', 'RO'],
-                          ['X180 q0', 'I q1', 'X180 q2', 'X180 q3', 'RO'],
-                          ['I q0', 'X180 q1', 'X180 q2',  'X180 q3', 'RO'],
-                          ['X180 q0', 'X180 q1', 'X180 q2',  'X180 q3', 'RO']]
-
-    for i, pulse_comb in enumerate(pulse_combinations):
-        pulses = []
-        for p in pulse_comb:
-            pulses += [pulse_dict[p]]
-
-        el = multi_pulse_elt(i, station, pulses)
-        el_list.append(el)
-        seq.append_element(el, trigger_wait=True)
-    station.pulsar.program_awgs(seq, *el_list, verbose=verbose)
-    if return_seq:
-        return seq, el_list
-    else:
-        return seq_name
+    return _off_on_seq([q0_pulse_pars, q1_pulse_pars, q2_pulse_pars,
+                        q3_pulse_pars], RO_pars,
+                       return_seq=return_seq, verbose=verbose)
 
 
 def five_qubit_off_on(q0_pulse_pars,
@@ -202,95 +161,9 @@ def five_qubit_off_on(q0_pulse_pars,
                       q4_pulse_pars,
                       RO_pars,
                       return_seq=False, verbose=False):
-
-    seq_name = '5_qubit_OffOn_sequence'
-    seq = sequence.Sequence(seq_name)
-    station.pulsar.update_channel_settings()
-    el_list = []
-    # Create a dict with the parameters for all the pulses
-    q0_pulses = add_suffix_to_dict_keys(
-        get_pulse_dict_from_pars(q0_pulse_pars), ' q0')
-    q1_pulses = add_suffix_to_dict_keys(
-        get_pulse_dict_from_pars(q1_pulse_pars), ' q1')
-    q2_pulses = add_suffix_to_dict_keys(
-        get_pulse_dict_from_pars(q2_pulse_pars), ' q2')
-    q3_pulses = add_suffix_to_dict_keys(
-        get_pulse_dict_from_pars(q3_pulse_pars), ' q3')
-    q4_pulses = add_suffix_to_dict_keys(
-        get_pulse_dict_from_pars(q4_pulse_pars), ' q4')
-    RO_dict = {'RO': RO_pars}
-
-    pulse_dict = {}
-    pulse_dict.update(q0_pulses)
-    pulse_dict.update(q1_pulses)
-    pulse_dict.update(q2_pulses)
-    pulse_dict.update(q3_pulses)
-    pulse_dict.update(q4_pulses)
-    pulse_dict.update(RO_dict)
-
-    # N.B. Identities not needed in all cases
-    pulse_combinations = [['I q0', 'I q1', 'I q2', 'I q3', 'I q4', 'RO'],
-                          ['X180 q0', 'I q1', 'I q2', 'I q3', 'I q4', 'RO'],
-                          ['I q0', 'X180 q1', 'I q2', 'I q3', 'I q4', 'RO'],
-                          ['X180 q0', 'X180 q1', 'I q2', 'I q3', 'I q4', 'RO'],
-                          ['I q0', 'I q1', 'X180 q2', 'I q3', 'I q4', 'RO'],
-                          ['X180 q0', 'I q1', 'X180 q2', 'I q3', 'I q4', 'RO'],
-                          ['I q0', 'X180 q1', 'X180 q2',
-                              'I q3', 'I q4', 'RO'],
-                          ['X180 q0', 'X180 q1', 'X180 q2',
-                              'I q3', 'I q4', 'RO'],
-                          ['I q0', 'I q1', 'I q2', 'X180 q3', 'I q4', 'RO'],
-                          ['X180 q0', 'I q1', 'I q2', 'X180 q3', 'I q4', 'RO'],
-                          ['I q0', 'X180 q1', 'I q2', 'X180 q3', 'I q4', 'RO'],
-                          ['X180 q0', 'X180 q1', 'I q2',
-                              'X180 q3', 'I q4', 'RO'],
-                          ['I q0', 'I q1', 'X180 q2', 'X180 q3', 'I q4', 'RO'],
-                          ['X180 q0', 'I q1', 'X180 q2',
-                              'X180 q3', 'I q4', 'RO'],
-                          ['I q0', 'X180 q1', 'X180 q2',
-                              'X180 q3', 'I q4', 'RO'],
-                          ['X180 q0', 'X180 q1', 'X180 q2',
-                              'X180 q3', 'I q4', 'RO'],
-                          ['I q0', 'I q1', 'I q2', 'I q3', 'X180 q4', 'RO'],
-                          ['X180 q0', 'I q1', 'I q2', 'I q3', 'X180 q4', 'RO'],
-                          ['I q0', 'X180 q1', 'I q2', 'I q3', 'X180 q4', 'RO'],
-                          ['X180 q0', 'X180 q1', 'I q2',
-                              'I q3', 'X180 q4', 'RO'],
-                          ['I q0', 'I q1', 'X180 q2', 'I q3', 'X180 q4', 'RO'],
-                          ['X180 q0', 'I q1', 'X180 q2',
-                              'I q3', 'X180 q4', 'RO'],
-                          ['I q0', 'X180 q1', 'X180 q2',
-                              'I q3', 'X180 q4', 'RO'],
-                          ['X180 q0', 'X180 q1', 'X180 q2',
-                              'I q3', 'X180 q4', 'RO'],
-                          ['I q0', 'I q1', 'I q2', 'X180 q3', 'X180 q4', 'RO'],
-                          ['X180 q0', 'I q1', 'I q2',
-                              'X180 q3', 'X180 q4', 'RO'],
-                          ['I q0', 'X180 q1', 'I q2',
-                              'X180 q3', 'X180 q4', 'RO'],
-                          ['X180 q0', 'X180 q1', 'I q2',
-                              'X180 q3', 'X180 q4', 'RO'],
-                          ['I q0', 'I q1', 'X180 q2',
-                              'X180 q3', 'X180 q4', 'RO'],
-                          ['X180 q0', 'I q1', 'X180 q2',
-                              'X180 q3', 'X180 q4', 'RO'],
-                          ['I q0', 'X180 q1', 'X180 q2',
-                              'X180 q3', 'X180 q4', 'RO'],
-                          ['X180 q0', 'X180 q1', 'X180 q2',  'X180 q3', 'X180 q4', 'RO']]
-
-    for i, pulse_comb in enumerate(pulse_combinations):
-        pulses = []
-        for p in pulse_comb:
-            pulses += [pulse_dict[p]]
-
-        el = multi_pulse_elt(i, station, pulses)
-        el_list.append(el)
-        seq.append_element(el, trigger_wait=True)
-    station.pulsar.program_awgs(seq, *el_list, verbose=verbose)
-    if return_seq:
-        return seq, el_list
-    else:
-        return seq_name
+    return _off_on_seq([q0_pulse_pars, q1_pulse_pars, q2_pulse_pars,
+                        q3_pulse_pars, q4_pulse_pars], RO_pars,
+                       return_seq=return_seq, verbose=verbose)
 
 
 def two_qubit_AllXY(operation_dict, q0='q0', q1='q1', RO_target='all',
@@ -384,13 +257,11 @@ def two_qubit_AllXY(operation_dict, q0='q0', q1='q1', RO_target='all',
                                  " ['interleaved', simultaneous', 'sequential', 'sandwiched']")
 
     for i, pulse_comb in enumerate(pulse_list):
-        pulses = []
-        for p in pulse_comb:
-            pulses += [operation_dict[p]]
+        pulses = [operation_dict[p] for p in pulse_comb]
 
         el = multi_pulse_elt(i, station, pulses, sequencer_config)
         el_list.append(el)
-        seq.append_element(el, trigger_wait=True)
+    seq.extend_elements(el_list, trigger_wait=True)
     if upload:
         station.pulsar.program_awgs(seq, *el_list, verbose=verbose)
     if return_seq:
@@ -414,9 +285,9 @@ def two_qubit_tomo_cardinal(cardinal,
     el_list = []
     # Create a dict with the parameters for all the pulses
     q0_pulses = add_suffix_to_dict_keys(
-        get_pulse_dict_from_pars(q0_pulse_pars), ' q0')
+        _get_pulse_dict_cached(q0_pulse_pars), ' q0')
     q1_pulses = add_suffix_to_dict_keys(
-        get_pulse_dict_from_pars(q1_pulse_pars), ' q1')
+        _get_pulse_dict_cached(q1_pulse_pars), ' q1')
     RO_dict = {'RO': RO_pars}
 
     pulse_dict = {}
@@ -437,8 +308,8 @@ def two_qubit_tomo_cardinal(cardinal,
                     'mY90 q1', 'X90 q1', 'mX90 q1']
 
     # inner loop on q0
-    prep_idx_q0 = int(cardinal % 6)
-    prep_idx_q1 = int(((cardinal - prep_idx_q0)/6) % 6)
+    prep_idx_q0 = int(cardinal) % 6
+    prep_idx_q1 = int(cardinal) // 6 % 6
 
     prep_pulse_q0 = pulse_dict[tomo_list_q0[prep_idx_q0]]
     prep_pulse_q1 = pulse_dict[tomo_list_q1[prep_idx_q1]]
@@ -449,39 +320,9 @@ def two_qubit_tomo_cardinal(cardinal,
     RO_pars['pulse_delay'] += msmt_buffer - (prep_pulse_q1['sigma'] *
                                              prep_pulse_q1['nr_sigma'])
 
-    # Calibration points
-    cal_points = [['I q0', 'I q1', 'RO'],
-                  ['I q0', 'I q1', 'RO'],
-                  ['I q0', 'I q1', 'RO'],
-                  ['I q0', 'I q1', 'RO'],
-                  ['I q0', 'I q1', 'RO'],
-                  ['I q0', 'I q1', 'RO'],
-                  ['I q0', 'I q1', 'RO'],
-                  ['X180 q0', 'I q1', 'RO'],
-                  ['X180 q0', 'I q1', 'RO'],
-                  ['X180 q0', 'I q1', 'RO'],
-                  ['X180 q0', 'I q1', 'RO'],
-                  ['X180 q0', 'I q1', 'RO'],
-                  ['X180 q0', 'I q1', 'RO'],
-                  ['X180 q0', 'I q1', 'RO'],
-                  ['I q0', 'X180 q1', 'RO'],
-                  ['I q0', 'X180 q1', 'RO'],
-                  ['I q0', 'X180 q1', 'RO'],
-                  ['I q0', 'X180 q1', 'RO'],
-                  ['I q0', 'X180 q1', 'RO'],
-                  ['I q0', 'X180 q1', 'RO'],
-                  ['I q0', 'X180 q1', 'RO'],
-                  ['X180 q0', 'X180 q1', 'RO'],
-                  ['X180 q0', 'X180 q1', 'RO'],
-                  ['X180 q0', 'X180 q1', 'RO'],
-                  ['X180 q0', 'X180 q1', 'RO'],
-                  ['X180 q0', 'X180 q1', 'RO'],
-                  ['X180 q0', 'X180 q1', 'RO'],
-                  ['X180 q0', 'X180 q1', 'RO']]
-
     for i in range(36):
-        tomo_idx_q0 = int(i % 6)
-        tomo_idx_q1 = int(((i - tomo_idx_q0)/6) % 6)
+        tomo_idx_q0 = i % 6
+        tomo_idx_q1 = i // 6 % 6
 
         # print(i,tomo_idx_q0,tomo_idx_q1)
 
@@ -500,16 +341,13 @@ def two_qubit_tomo_cardinal(cardinal,
                       RO_pars]
         el = multi_pulse_elt(i, station, pulse_list)
         el_list.append(el)
-        seq.append_element(el, trigger_wait=True)
 
-    for i, pulse_comb in enumerate(cal_points):
-        pulses = []
-        for p in pulse_comb:
-            pulses += [pulse_dict[p]]
+    for i, pulse_comb in enumerate(_CAL_POINTS_2Q_TOMO):
+        pulses = [pulse_dict[p] for p in pulse_comb]
 
         el = multi_pulse_elt(35+i, station, pulses)
         el_list.append(el)
-        seq.append_element(el, trigger_wait=True)
+    seq.extend_elements(el_list, trigger_wait=True)
 
     station.pulsar.program_awgs(seq, *el_list, verbose=verbose)
     if return_seq:
@@ -652,8 +490,8 @@ def two_qubit_tomo_bell(bell_state,
     seq_pulse_list = []
 
     for i in range(36):
-        tomo_idx_qS = int(i % 6)
-        tomo_idx_qCZ = int(((i - tomo_idx_qS)/6) % 6)
+        tomo_idx_qS = i % 6
+        tomo_idx_qCZ = i // 6 % 6
         base_sequence[8] = tomo_list_qCZ[tomo_idx_qCZ]
         base_sequence[9] = tomo_list_qS[tomo_idx_qS]
         seq_pulse_list += [deepcopy(base_sequence)]
@@ -669,9 +507,7 @@ def two_qubit_tomo_bell(bell_state,
             seq_pulse_list += [cal_pulses]
 
     for i, pulse_list in enumerate(seq_pulse_list):
-        pulses = []
-        for p in pulse_list:
-            pulses += [operation_dict[p]]
+        pulses = [operation_dict[p] for p in pulse_list]
         el = multi_pulse_elt(i, station, pulses, sequencer_config)
         if distortion_dict is not None:
             print('\rDistorting element {}/{} '.format(i+1,
@@ -680,7 +516,7 @@ def two_qubit_tomo_bell(bell_state,
             el = distort_and_compensate(
                 el, distortion_dict)
         el_list.append(el)
-        seq.append_element(el, trigger_wait=True)
+    seq.extend_elements(el_list, trigger_wait=True)
 
     station.pulsar.program_awgs(seq, *el_list, verbose=verbose)
 
@@ -693,16 +529,15 @@ def cphase_fringes(phases, q0_pulse_pars, q1_pulse_pars, RO_pars,
     '''
     '''
     preloaded_kernels_vec = preload_kernels_func(distortion_dict)
-    original_delay = deepcopy(RO_pars)[0]['pulse_delay']
+    original_delay = RO_pars[0]['pulse_delay']
     seq_name = 'CPhase'
     seq = sequence.Sequence(seq_name)
     station.pulsar.update_channel_settings()
-    el_list = []
     # print(q0_pulse_pars)
     q0_pulses = add_suffix_to_dict_keys(
-        get_pulse_dict_from_pars(q0_pulse_pars[0]), ' q0')
+        _get_pulse_dict_cached(q0_pulse_pars[0]), ' q0')
     q1_pulses = add_suffix_to_dict_keys(
-        get_pulse_dict_from_pars(q1_pulse_pars[0]), ' q1')
+        _get_pulse_dict_cached(q1_pulse_pars[0]), ' q1')
 
     pulse_dict = {}
     pulse_dict.update(q0_pulses)
@@ -718,32 +553,32 @@ def cphase_fringes(phases, q0_pulse_pars, q1_pulse_pars, RO_pars,
     # print(buffer_mw_flux,buffer_flux_mw,msmt_buffer,dead_time)
 
     # defining main pulses
-    exc_pulse = deepcopy(pulse_dict['X180 q0'])
+    exc_pulse = dict(pulse_dict['X180 q0'])
     exc_pulse['pulse_delay'] += 0.01e-6
-    swap_pulse_1 = deepcopy(swap_pars_q0[0])
+    swap_pulse_1 = dict(swap_pars_q0[0])
     # print(swap_pulse_1)
     swap_pulse_1['pulse_delay'] = buffer_mw_flux + \
         exc_pulse['sigma']*exc_pulse['nr_sigma']
 
-    ramsey_1 = deepcopy(pulse_dict['Y90 q1'])
+    ramsey_1 = dict(pulse_dict['Y90 q1'])
     ramsey_1['pulse_delay'] = buffer_flux_mw + swap_pulse_1['length']
     cphase_pulse = cphase_pars_q1[0]
     cphase_amp = cphase_pulse['amplitude']
     cphase_pulse['pulse_delay'] = buffer_mw_flux + \
         ramsey_1['sigma']*ramsey_1['nr_sigma']
-    ramsey_2 = deepcopy(pulse_dict['X90 q1'])
+    ramsey_2 = dict(pulse_dict['X90 q1'])
     ramsey_2['pulse_delay'] = buffer_flux_mw + cphase_pulse['length']
 
-    swap_pulse_2 = deepcopy(swap_pars_q0[0])
+    swap_pulse_2 = dict(swap_pars_q0[0])
     swap_pulse_2['pulse_delay'] = buffer_mw_flux + \
         ramsey_2['sigma']*ramsey_2['nr_sigma']
     RO_pars[0]['pulse_delay'] = msmt_buffer + swap_pulse_2['length']
 
     # defining compensation pulses
-    swap_comp_1 = deepcopy(swap_pulse_1)
+    swap_comp_1 = dict(swap_pulse_1)
     swap_pulse_1['pulse_delay'] = RO_pars[0]['length'] + dead_time
-    cphase_comp = deepcopy(cphase_pulse)
-    swap_comp_2 = deepcopy(swap_pulse_2)
+    cphase_comp = dict(cphase_pulse)
+    swap_comp_2 = dict(swap_pulse_2)
 
     dead_time_pulse = {'pulse_type': 'SquarePulse',
                        'pulse_delay': RO_pars[0]['pulse_delay'],
@@ -751,39 +586,31 @@ def cphase_fringes(phases, q0_pulse_pars, q1_pulse_pars, RO_pars,
                        'amplitude': 0,
                        'length': dead_time}
 
+    # the pulse list is the same for every phase, only the phase of the
+    # second ramsey pulse and the cphase pulse (index 3) are changed.
+    cphase_on = dict(cphase_pulse, amplitude=cphase_amp)
+    cphase_off = dict(cphase_pulse, amplitude=0.)
+    pulse_list = [exc_pulse,
+                  swap_pulse_1,
+                  ramsey_1,
+                  cphase_on,
+                  ramsey_2,
+                  swap_pulse_2,
+                  RO_pars[0],
+                  swap_comp_1,
+                  cphase_comp,
+                  swap_comp_2,
+                  dead_time_pulse]
+    el_list = [None] * (2*len(phases[0]))
     for i, ph2 in enumerate(phases[0]):
         # print(ph2)
         ramsey_2['phase'] = ph2
 
-        cphase_pulse['amplitude'] = cphase_amp
-        pulse_list = [exc_pulse,
-                      swap_pulse_1,
-                      ramsey_1,
-                      cphase_pulse,
-                      ramsey_2,
-                      swap_pulse_2,
-                      RO_pars[0],
-                      swap_comp_1,
-                      cphase_comp,
-                      swap_comp_2,
-                      dead_time_pulse]
-        el = multi_pulse_elt(2*i, station, pulse_list)
-        el_list.append(el)
+        pulse_list[3] = cphase_on
+        el_list[2*i] = multi_pulse_elt(2*i, station, pulse_list)
 
-        cphase_pulse['amplitude'] = 0.
-        pulse_list = [exc_pulse,
-                      swap_pulse_1,
-                      ramsey_1,
-                      cphase_pulse,
-                      ramsey_2,
-                      swap_pulse_2,
-                      RO_pars[0],
-                      swap_comp_1,
-                      cphase_comp,
-                      swap_comp_2,
-                      dead_time_pulse]
-        el = multi_pulse_elt(2*i+1, station, pulse_list)
-        el_list.append(el)
+        pulse_list[3] = cphase_off
+        el_list[2*i+1] = multi_pulse_elt(2*i+1, station, pulse_list)
 
     # Compensations
     for i, el in enumerate(el_list):
@@ -791,29 +618,18 @@ def cphase_fringes(phases, q0_pulse_pars, q1_pulse_pars, RO_pars,
             el = distort_and_compensate(
                 el, distortion_dict, preloaded_kernels_vec)
             el_list[i] = el
-        seq.append_element(el, trigger_wait=True)
-    cal_points = 4
     RO_pars[0]['pulse_delay'] = original_delay
 
     # Calibration points
-    cal_points = [['I q0', 'I q1', 'RO'],
-                  ['I q0', 'I q1', 'RO'],
-                  ['X180 q0', 'I q1', 'RO'],
-                  ['X180 q0', 'I q1', 'RO'],
-                  ['I q0', 'X180 q1', 'RO'],
-                  ['I q0', 'X180 q1', 'RO'],
-                  ['X180 q0', 'X180 q1', 'RO'],
-                  ['X180 q0', 'X180 q1', 'RO']]
-
-    for i, pulse_comb in enumerate(cal_points):
-        pulses = []
-        for p in pulse_comb:
-            pulses += [pulse_dict[p]]
+    for i, pulse_comb in enumerate(_CAL_POINTS_CPHASE):
+        pulses = [pulse_dict[p] for p in pulse_comb]
+        # copy first element and set extra wait
+        pulses[0] = dict(pulses[0])
         pulses[0]['pulse_delay'] += 0.01e-6
 
         el = multi_pulse_elt(2*len(phases)+i, station, pulses)
         el_list.append(el)
-        seq.append_element(el, trigger_wait=True)
+    seq.extend_elements(el_list, trigger_wait=True)
 
     # upload
     if upload:
@@ -824,22 +640,79 @@ def cphase_fringes(phases, q0_pulse_pars, q1_pulse_pars, RO_pars,
         return seq
 
 
+def _kernel_npy_fn(kernel):
+    return os.path.splitext(kernel_dir+kernel)[0] + '.npy'
+
+
+def load_kernel(kernel):
+    '''
+    Loads the kernel with file name kernel from kernel_dir as a float32
+    array. A binary copy of the kernel (see convert_kernel_to_npy) is used
+    if it is not older than the text file, as it is much faster to load.
+    Kernels already loaded by preload_kernels_func are only read again
+    after clear_kernel_caches.
+    '''
+    txt_fn = kernel_dir+kernel
+    npy_fn = _kernel_npy_fn(kernel)
+    if os.path.isfile(npy_fn) and (
+            not os.path.isfile(txt_fn) or
+            os.path.getmtime(npy_fn) >= os.path.getmtime(txt_fn)):
+        return np.load(npy_fn).astype(np.float32, copy=False)
+    return np.loadtxt(txt_fn, dtype=np.float32)
+
+
+def convert_kernel_to_npy(kernel):
+    '''
+    Stores a binary copy of the text file kernel in kernel_dir next to it,
+    which is used by load_kernel from then on.
+    '''
+    np.save(_kernel_npy_fn(kernel),
+            np.loadtxt(kernel_dir+kernel, dtype=np.float32))
+
+
+def clear_kernel_caches():
+    '''
+    Empties the caches of the kernels loaded by preload_kernels_func, the
+    kernels are read from kernel_dir again the next time they are used.
+    '''
+    cached_kernels.clear()
+    cached_combined_kernels.clear()
+    clear_kernel_rfft_cache()
+
+
 def preload_kernels_func(distortion_dict):
+    '''
+    Loads the kernels listed for every channel in distortion_dict from
+    kernel_dir. As convolution is associative the kernels of a channel are
+    combined into a single kernel, the returned dict contains a list with
+    this kernel for every channel in distortion_dict['ch_list'].
+    '''
     output_dict = {ch: [] for ch in distortion_dict['ch_list']}
     for ch in distortion_dict['ch_list']:
-        for kernel in distortion_dict[ch]:
-            if kernel is not '':
-                if kernel in cached_kernels.keys():
-                    print('Cached {}'.format(kernel_dir+kernel))
-                    output_dict[ch].append(cached_kernels[kernel])
-                else:
-                    print('Loading {}'.format(kernel_dir+kernel))
-                    # print(os.path.isfile('kernels/'+kernel))
-                    kernel_vec = np.loadtxt(kernel_dir+kernel)
-                    output_dict[ch].append(kernel_vec)
-                    cached_kernels.update({kernel: kernel_vec})
+        kernel_names = tuple(k for k in distortion_dict[ch] if k)
+        if not kernel_names:
+            continue
+        kernel_vecs = []
+        for kernel in kernel_names:
+            if kernel in cached_kernels.keys():
+                print('Cached {}'.format(kernel_dir+kernel))
+                kernel_vecs.append(cached_kernels[kernel])
+            else:
+                print('Loading {}'.format(kernel_dir+kernel))
+                kernel_vec = load_kernel(kernel)
+                kernel_vecs.append(kernel_vec)
+                cached_kernels.update({kernel: kernel_vec})
+        # the combined kernel is only reused if it was made from the kernels
+        # that are currently in cached_kernels
+        entry = cached_combined_kernels.get(kernel_names)
+        if entry is None or any(
+                a is not b for a, b in zip(entry[0], kernel_vecs)):
+            entry = (kernel_vecs, reduce(signal.fftconvolve, kernel_vecs))
+            cached_combined_kernels[kernel_names] = entry
+        output_dict[ch].append(entry[1])
     return output_dict
 
+
 def two_qubit_tomo_cphase_cardinal(cardinal_state,
                         operation_dict,
                         qS,
@@ -904,8 +777,8 @@ def two_qubit_tomo_cphase_cardinal(cardinal_state,
     # cardinal states  #
     ################
     # here select the qubit gates (depending on cardinal_state)
-    prep_idx_qS = int(cardinal_state % 6)
-    prep_idx_qCZ = int(((cardinal_state - prep_idx_qS)/6) % 6)
+    prep_idx_qS = int(cardinal_state) % 6
+    prep_idx_qCZ = int(cardinal_state) // 6 % 6
 
     print('Compensation qCP {:.3f}'.format(
         operation_dict['CZ_corr ' + qCZ]['amplitude']))
@@ -923,8 +796,8 @@ def two_qubit_tomo_cphase_cardinal(cardinal_state,
     seq_pulse_list = []
 
     for i in range(36):
-        tomo_idx_qS = int(i % 6)
-        tomo_idx_qCZ = int(((i - tomo_idx_qS)/6) % 6)
+        tomo_idx_qS = i % 6
+        tomo_idx_qCZ = i // 6 % 6
         base_sequence[8] = tomo_list_qCZ[tomo_idx_qCZ]
         base_sequence[9] = tomo_list_qS[tomo_idx_qS]
         seq_pulse_list += [deepcopy(base_sequence)]
@@ -940,9 +813,7 @@ def two_qubit_tomo_cphase_cardinal(cardinal_state,
             seq_pulse_list += [cal_pulses]
 
     for i, pulse_list in enumerate(seq_pulse_list):
-        pulses = []
-        for p in pulse_list:
-            pulses += [operation_dict[p]]
+        pulses = [operation_dict[p] for p in pulse_list]
         el = multi_pulse_elt(i, station, pulses, sequencer_config)
         if distortion_dict is not None:
             print('\rDistorting element {}/{} '.format(i+1,
@@ -951,7 +822,7 @@ def two_qubit_tomo_cphase_cardinal(cardinal_state,
             el = distort_and_compensate(
                 el, distortion_dict)
         el_list.append(el)
-        seq.append_element(el, trigger_wait=True)
+    seq.extend_elements(el_list, trigger_wait=True)
 
     station.pulsar.program_awgs(seq, *el_list, verbose=verbose)
 
@@ -994,12 +865,10 @@ def n_qubit_off_on(pulse_pars_list, RO_pars, return_seq=False, verbose=False,
         pulse_combinations.append(pulse_comb)
 
     for i, pulse_comb in enumerate(pulse_combinations):
-        pulses = []
-        for j, p in enumerate(pulse_comb):
-            pulses += [pulse_dict[p]]
+        pulses = [pulse_dict[p] for p in pulse_comb]
         el = multi_pulse_elt(i, station, pulses)
         el_list.append(el)
-        seq.append_element(el, trigger_wait=True)
+    seq.extend_elements(el_list, trigger_wait=True)
     station.pulsar.program_awgs(seq, *el_list, verbose=verbose)
     if return_seq:
         return seq, el_list
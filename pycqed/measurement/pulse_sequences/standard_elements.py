@@ -1,6 +1,9 @@
 import logging
 import numpy as np
+from scipy import signal
+from scipy.fftpack import next_fast_len
 from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor
 try:
     from math import gcd
 except:  # Moved to math in python 3.5, this is to be 3.4 compatible
@@ -12,6 +15,7 @@ from ..waveform_control.pulse_library import MW_IQmod_pulse, SSB_DRAG_pulse, \
     Mux_DRAG_pulse, SquareFluxPulse, MartinisFluxPulse
 from ..waveform_control.pulse import CosPulse, SquarePulse
 from pycqed.measurement.randomized_benchmarking import randomized_benchmarking as rb
+from pycqed.utilities.general import LRUCache
 
 from importlib import reload
 reload(pulse)
@@ -240,7 +244,78 @@ def multi_pulse_elt(i, station, pulse_list, sequencer_config=None):
     return el
 
 
-def distort_and_compensate(element, distortion_dict):
+# (kernel, spectrum) by (id of kernel, n), see _kernel_rfft. Only the most
+# recently used entries are kept, the cache is shared by the threads of
+# _get_distort_executor.
+_KERNEL_RFFT_CACHE_SIZE = 32
+_kernel_rfft_cache = LRUCache(_KERNEL_RFFT_CACHE_SIZE)
+
+
+def _kernel_rfft(kernelvec, n):
+    '''
+    Returns np.fft.rfft(kernelvec, n). The transform of a preloaded kernel
+    is computed once for every n and reused for all elements.
+    '''
+    key = (id(kernelvec), n)
+    entry = _kernel_rfft_cache.get(key)
+    if entry is None or entry[0] is not kernelvec:
+        entry = (kernelvec, np.fft.rfft(kernelvec, n))
+        _kernel_rfft_cache[key] = entry
+    return entry[1]
+
+
+def clear_kernel_rfft_cache():
+    '''
+    Removes the cached transforms of the preloaded kernels.
+    '''
+    _kernel_rfft_cache.clear()
+
+
+# shared by all calls of distort_and_compensate, see _get_distort_executor
+_distort_executor = None
+
+
+def _get_distort_executor():
+    '''
+    Returns the thread pool that distorts the channels of an element in
+    parallel, it is created the first time it is needed.
+    '''
+    global _distort_executor
+    if _distort_executor is None:
+        _distort_executor = ThreadPoolExecutor()
+    return _distort_executor
+
+
+def _distort_wf(wf, ch, distortion_dict, preloaded_kernels=None):
+    '''
+    Returns the waveform wf of channel ch distorted by the kernel(s) of that
+    channel, see distort_and_compensate.
+    '''
+    length = len(wf)
+    if preloaded_kernels is not None and not preloaded_kernels[ch]:
+        # no kernels for this channel, the waveform passes through unchanged
+        return wf
+    if preloaded_kernels is None:
+        kernelvec = distortion_dict[ch]
+        # signal.convolve switches to FFT convolution for long kernels
+        distorted_wf = signal.convolve(wf, kernelvec)
+    else:
+        # convolve with all kernels at once by multiplying the spectra,
+        # n is large enough to prevent wrap around of the convolution.
+        kernels = preloaded_kernels[ch]
+        n = next_fast_len(length + sum(len(k) - 1 for k in kernels))
+        # the preloaded kernels are single precision, the error this
+        # introduces is far below the resolution of the AWG DACs.
+        spectrum = np.fft.rfft(wf.astype(np.float32), n)
+        for kernelvec in kernels:
+            spectrum *= _kernel_rfft(kernelvec, n)
+        distorted_wf = np.fft.irfft(spectrum, n)
+    # copying the truncated waveform prevents keeping the full length
+    # convolution alive in the element for as long as it exists.
+    return distorted_wf[:length].astype(wf.dtype)
+
+
+def distort_and_compensate(element, distortion_dict, preloaded_kernels=None):
     """
     Distorts an element using the contenst of a distortion dictionary.
     The distortion dictionary should be formatted as follows.
@@ -248,13 +323,27 @@ def distort_and_compensate(element, distortion_dict):
     dist_dict{'ch_list': ['chx', 'chy'],
               'chx': np.array(.....),
               'chy': np.array(.....)}
+
+    If preloaded_kernels is specified (see preload_kernels_func in
+    multi_qubit_tek_seq_elts), the channels in dist_dict['ch_list'] are
+    instead distorted by all kernels in the list preloaded_kernels[ch].
     """
     t_vals, outputs_dict = element.waveforms()
-    for ch in distortion_dict['ch_list']:
+    ch_list = distortion_dict['ch_list']
+
+    def distort_ch(ch):
+        return _distort_wf(outputs_dict[ch], ch, distortion_dict,
+                           preloaded_kernels)
+
+    if len(ch_list) > 1:
+        # the channels are independent and numpy releases the GIL while
+        # transforming and convolving, these are distorted in parallel.
+        distorted_wfs = list(_get_distort_executor().map(distort_ch, ch_list))
+    else:
+        distorted_wfs = [distort_ch(ch) for ch in ch_list]
+
+    for ch, distorted_wf in zip(ch_list, distorted_wfs):
         element._channels[ch]['distorted'] = True
-        length = len(outputs_dict[ch])
-        kernelvec = distortion_dict[ch]
-        outputs_dict[ch] = np.convolve(
-            outputs_dict[ch], kernelvec)[:length]
-        element.distorted_wfs[ch] = outputs_dict[ch][:len(t_vals)]
+        outputs_dict[ch] = distorted_wf
+        element.distorted_wfs[ch] = distorted_wf[:len(t_vals)]
     return element
@@ -85,4 +85,23 @@ class Sequence:
         # extract params from the input element
         name = element.name
         wfname = element.name
-        self.insert_element(name, wfname, **kw)
\ No newline at end of file
+        self.insert_element(name, wfname, **kw)
+
+    def extend_elements(self, elements, repetitions=1, goto_target=None,
+                        jump_target=None, trigger_wait=False, **kw):
+        """
+        Appends a list of elements at once, equivalent to calling
+        append_element for every element but the names are checked for
+        duplicates in a single pass instead of once per element.
+        """
+        names = {elt['name'] for elt in self.elements}
+        new_elts = []
+        for element in elements:
+            if element.name in names:
+                raise KeyError('Dyplicate element {}. Element names in sequence'
+                               ' must be unique.'.format(element.name))
+            names.add(element.name)
+            new_elts.append(self._make_element_spec(
+                element.name, element.name, repetitions, goto_target,
+                jump_target, trigger_wait))
+        self.elements.extend(new_elts)
@@ -21,6 +21,8 @@ Read the class doc string for the usage.
 import logging
 import json
 import os
+import re
+import sys
 import bisect
 import copy
 from pycqed.utilities.general import int_to_bin
@@ -39,6 +41,9 @@ user_op_type = {
     "measurement": EventType.MEASUREMENT
 }
 
+# event types of operations that act on qubits
+q_op_types = frozenset(user_op_type.values())
+
 default_op_dict = {
     "Idx": {
         "parameters": 1,  # Parameter is wait in ns
@@ -63,6 +68,9 @@ default_op_dict = {
 
 class QASM_QuMIS_Compiler():
 
+    # a token is a run of characters other than commas and whitespace
+    _token_re = re.compile(r'[^,\s]+')
+
     def __repr__(self):
         base_str = ('QASM_QuMIS_Compiler(config_filename={}, '
                     'verbosity_level={})')
@@ -103,6 +111,7 @@ class QASM_QuMIS_Compiler():
         self.prog_lines = None
         self.qasm_op_dict = None
         self.declared_qubits = []
+        self._declared_qubits_set = set()  # for fast membership tests
         self.qubit_map = {}
         self.verbosity_level = verbosity_level
         self.channel_latency_compensated = False
@@ -207,7 +216,7 @@ class QASM_QuMIS_Compiler():
             op_type_enum = user_op_type[op_type_str]
             op_spec["type"] = op_type_enum
             op_spec["duration"] = int(op_spec["duration"] / self.cycle_time)
-            if op_type_enum == EventType.MEASUREMENT:
+            if op_type_enum is EventType.MEASUREMENT:
                 self.measureMENT_time = int(op_spec["duration"] /
                                             self.cycle_time)
             self.user_qasm_op_dict[key] = op_spec
@@ -220,6 +229,12 @@ class QASM_QuMIS_Compiler():
 
         self.qasm_op_dict = {**default_op_dict, **self.user_qasm_op_dict}
         self.qasm_op_dict = lower_dict_key(self.qasm_op_dict)
+        # (type, parameters, is_single_line_op) of every operation, avoids
+        # nested dict lookups for every event when parsing the program.
+        self._op_meta = {
+            sys.intern(name): (spec["type"], spec["parameters"],
+                               self.is_single_line_op(spec["type"]))
+            for name, spec in self.qasm_op_dict.items()}
         if self.verbosity_level > 3:
             self.print_op_dict()
 
@@ -231,11 +246,11 @@ class QASM_QuMIS_Compiler():
                 op_dict[op]["duration"] =\
                     op_dict[op]["duration"] * self.cycle_time
             if "type" in self.user_qasm_op_dict[op]:
-                if op_dict[op]["type"] == EventType.RF:
+                if op_dict[op]["type"] is EventType.RF:
                     op_dict[op]["type"] = "rf"
-                elif op_dict[op]["type"] == EventType.FLUX:
+                elif op_dict[op]["type"] is EventType.FLUX:
                     op_dict[op]["type"] = "flux"
-                elif op_dict[op]["type"] == EventType.MEASUREMENT:
+                elif op_dict[op]["type"] is EventType.MEASUREMENT:
                     op_dict[op]["type"] = "measure"
                 else:
                     raise ValueError("unexpected event type: {}".format(
@@ -278,41 +293,33 @@ class QASM_QuMIS_Compiler():
         Read all lines in the file.
         '''
         try:
-            prog_file = open(self.filename, 'r', encoding="utf-8")
-            logging.info("open file", str(self.filename), "successfully.")
-        except:
+            with open(self.filename, 'r', encoding="utf-8") as prog_file:
+                # the file is read at once and split into lines afterwards
+                lines = prog_file.read().splitlines()
+        except OSError:
             raise OSError('\tError: Failed to open file ' +
                           self.filename + ".")
+        logging.info("read file %s successfully.", self.filename)
 
-        self.raw_lines = []
-        self.prog_lines = []  # after removing comments.
-        for line_number, line_content in enumerate(prog_file):
-            self.raw_lines.append(
-                prog_line(line_number + 1, line_content.strip(' \t\n\r')))
-
-            line_content = self.remove_comment(line_content)
-            line_content = line_content.lower()
-            if (len(line_content) == 0):  # skip empty line and comment
-                continue
-            self.prog_lines.append(prog_line(line_number + 1, line_content))
+        self.raw_lines = [prog_line(line_number + 1, line_content.strip())
+                          for line_number, line_content in enumerate(lines)]
 
-        prog_file.close()
+        # after removing comments, empty lines and comments are skipped.
+        lines = [line_content.partition('#')[0].strip().lower()
+                 for line_content in lines]
+        self.prog_lines = [prog_line(line_number + 1, line_content)
+                           for line_number, line_content in enumerate(lines)
+                           if line_content]
         if self.verbosity_level >= 2:
             self.print_raw_lines()
         if self.verbosity_level >= 3:
             self.print_program_lines()
 
     def print_raw_lines(self):
-        print("Raw Lines:")
-        for line in self.raw_lines:
-            print(line)
-        print("")
+        self._print_block("Raw Lines:", map(str, self.raw_lines))
 
     def print_program_lines(self):
-        print("Program Lines:")
-        for line in self.prog_lines:
-            print(line)
-        print("")
+        self._print_block("Program Lines:", map(str, self.prog_lines))
 
     def print_op_dict(self):
         print("QASM operation dictionary:")
@@ -322,24 +329,27 @@ class QASM_QuMIS_Compiler():
         print("\n")
 
     def print_raw_events(self):
-        print("Raw events:")
-        for i, raw_events in enumerate(self.raw_event_list):
-            raw_print("{0:5d} : ".format(i))
-            for re in raw_events:
-                raw_print("({}, {}, {})".format(re.event_type,
-                                                re.name, re.params))
-            raw_print("\n")
-        print("")
+        self._print_block("Raw events:",
+                          self._format_event_lines(self.raw_event_list))
 
     def print_timing_events(self):
-        print("Timing events:")
-        for i, timing_events in enumerate(self.timing_event_list):
-            raw_print("{0:5d} : ".format(i))
-            for re in timing_events:
-                raw_print("({}, {}, {})".format(re.event_type,
-                                                re.name, re.params))
-            raw_print("\n")
-        print("")
+        self._print_block("Timing events:",
+                          self._format_event_lines(self.timing_event_list))
+
+    @classmethod
+    def _format_event_lines(self, event_list):
+        for i, events in enumerate(event_list):
+            yield "{0:5d} : ".format(i) + "".join(
+                "({}, {}, {})".format(e.event_type, e.name, e.params)
+                for e in events)
+
+    @classmethod
+    def _print_block(self, title, lines):
+        """
+        private method that prints a title followed by the lines and an
+        empty line using a single write.
+        """
+        raw_print("\n".join([title, *lines]) + "\n\n")
 
     def print_timing_grid(self):
 
@@ -454,17 +464,26 @@ class QASM_QuMIS_Compiler():
                         raw_print(" cw: %s" % str(e.codeword))
                 raw_print('; ')
 
+    def _syn(self, msg, lineno=None):
+        '''
+        Returns a SyntaxError with msg that points to the QASM file that is
+        being compiled and, if specified, to line lineno in that file.
+        '''
+        se = SyntaxError(msg)
+        se.filename = self.filename
+        se.lineno = lineno
+        return se
+
     @classmethod
     def remove_comment(self, line):
-        line = line.split('#', 1)[0]  # remove anything after '#' symbole
-        line = line.strip(' \t\n\r')  # remove whitespace
-        return line
+        # remove anything after '#' symbol and the surrounding whitespace
+        return line.partition('#')[0].strip()
 
     @classmethod
     def is_single_line_op(self, qasm_op_type):
-        if (qasm_op_type == EventType.WAIT) or \
-                (qasm_op_type == EventType.DECLARE) or \
-                (qasm_op_type == EventType.MAP):
+        if (qasm_op_type is EventType.WAIT) or \
+                (qasm_op_type is EventType.DECLARE) or \
+                (qasm_op_type is EventType.MAP):
             return True
         else:
             return False
@@ -477,124 +496,122 @@ class QASM_QuMIS_Compiler():
         Timing information of events is not generated.
         raw_event_list contains all events before resolving timing information.
         '''
+        # Using local variables here is for optimization
+        op_meta = self._op_meta
+        WAIT = EventType.WAIT
+        tokenize = self._token_re.findall
+        cycle_time = self.cycle_time
+
         self.raw_event_list = []
         for line in self.prog_lines:
-            events = self.get_parallel_qasm_ops(line.content)
+            # Most lines contain a single operation, these do not need to
+            # be split into parallel operations first.
+            if '|' not in line.content:
+                events = (tokenize(line.content),)
+            else:
+                events = self.get_parallel_qasm_ops(line.content)
             raw_events = []
-            for e in events:
-                qasm_op_name = self.get_qasm_op_name(e)
-                if qasm_op_name not in self.qasm_op_dict:
-                    se = SyntaxError("unsuppported QASM operation {}.".format(
-                        qasm_op_name))
-                    se.filename = self.filename
-                    se.lineno = line.number
-                    raise se
-
-                qasm_op_type = self.qasm_op_dict[qasm_op_name]["type"]
-
-                if self.is_single_line_op(qasm_op_type) and (len(events) != 1):
-                    se = SyntaxError("QASM instruction {} should e "
-                                     "occupy a line.".format(qasm_op_name))
-                    se.filename = self.filename
-                    se.lineno = line.number
-                    raise se
+            for tokens in events:
+                if not tokens:
+                    raise ValueError("QASM operation cannot be empty")
+                qasm_op_name = tokens[0]
+                meta = op_meta.get(qasm_op_name)
+                if meta is None:
+                    raise self._syn("unsuppported QASM operation {}.".format(
+                        qasm_op_name), line.number)
+
+                qasm_op_type, expected_num_of_params, single_line_op = meta
+
+                if single_line_op and (len(events) != 1):
+                    raise self._syn("QASM instruction {} should e "
+                                    "occupy a line.".format(qasm_op_name),
+                                    line.number)
 
                 # check parameter
-                qasm_op_params = self.get_qasm_op_params(e)
+                qasm_op_params = tokens[1:]
                 if (qasm_op_name == "qubit") and (len(qasm_op_params) < 1):
-                    se = SyntaxError("the QASM instruction qubit should "
-                                     "contain at least one parameter as "
-                                     "the declared qubit.")
-                    se.filename = self.filename
-                    se.lineno = line.number
-                    raise se
-
-                expected_num_of_params = self.qasm_op_dict[
-                    qasm_op_name]["parameters"]
+                    raise self._syn("the QASM instruction qubit should "
+                                    "contain at least one parameter as "
+                                    "the declared qubit.", line.number)
+
                 if (qasm_op_name != "qubit") and \
                         (len(qasm_op_params) != expected_num_of_params):
-                    se = SyntaxError("unexpected number of parameters for the"
-                                     " QASM instruction {}. {} parameter(s)"
-                                     " expected. Offered: {}.".format(
-                                         qasm_op_name,
-                                         expected_num_of_params,
-                                         qasm_op_params))
-                    se.filename = self.filename
-                    se.lineno = line.number
-                    raise se
-
-                if (qasm_op_type == EventType.WAIT) and \
+                    raise self._syn("unexpected number of parameters for the"
+                                    " QASM instruction {}. {} parameter(s)"
+                                    " expected. Offered: {}.".format(
+                                        qasm_op_name,
+                                        expected_num_of_params,
+                                        qasm_op_params), line.number)
+
+                if (qasm_op_type is WAIT) and \
                         (expected_num_of_params == 1):
                     waiting_time_ns, = qasm_op_params
 
-                    waiting_time = int(waiting_time_ns)//self.cycle_time
+                    waiting_time = int(waiting_time_ns)//cycle_time
                     if is_int(waiting_time) is False:
-                        se = SyntaxError("parameter {} is not an "
-                                         "integer.".format(waiting_time))
-                        se.filename = self.filename
-                        se.lineno = line.number
-                        raise se
+                        raise self._syn("parameter {} is not an "
+                                        "integer.".format(waiting_time),
+                                        line.number)
 
                     waiting_time = int(waiting_time)
                     if waiting_time < 0:
-                        ve = ValueError("parameter {} is not "
-                                        "positive.".format(waiting_time))
+                        ve = ValueError("parameter {} on line {} is not "
+                                        "positive.".format(waiting_time,
+                                                           line.number))
                         ve.filename = self.filename
                         ve.lineno = line.number
-                        raise se
+                        raise ve
 
                     qasm_op_params = [waiting_time]
 
-                raw_event = qasm_event()
-                raw_event.line_number = line.number
-                raw_event.name = qasm_op_name
-                raw_event.params = qasm_op_params
-                raw_event.event_type = qasm_op_type
-
-                raw_event.duration = 0
-                raw_events.append(raw_event)
+                raw_events.append(qasm_event(line.number, qasm_op_type,
+                                             qasm_op_name, qasm_op_params, 0))
             self.raw_event_list.append(raw_events)
 
     def is_wait_instr(self, qasm_op_name):
-        description = self.qasm_op_dict[qasm_op_name]
-        if (description["type"] == EventType.WAIT):
+        if (self._op_meta[qasm_op_name][0] is EventType.WAIT):
             return True
         else:
             return False
 
     @classmethod
     def is_wait_line(self, events):
-        if events[0].event_type == EventType.WAIT:
+        if events[0].event_type is EventType.WAIT:
             return True
         else:
             return False
 
     @classmethod
     def is_q_op_event(self, event):
-        op_type = event.event_type
-        if ((op_type == EventType.MEASUREMENT) or
-                (op_type == EventType.FLUX) or
-                (op_type == EventType.RF)):
-            return True
-        else:
-            return False
+        return event.event_type in q_op_types
 
     @classmethod
     def get_parallel_qasm_ops(self, op_line):
-        return [rawEle.replace(',', ' ').strip()
+        '''
+        Splits a line into its parallel operations, every operation is
+        returned as a list of tokens [name, param0, param1, ...].
+        '''
+        return [self._token_re.findall(rawEle)
                 for rawEle in op_line.split("|")]
 
     @classmethod
-    def get_qasm_op_name(self, qasm_op):
-        if qasm_op == '':
+    def get_qasm_op_tokens(self, qasm_op):
+        '''
+        Returns the tokens [name, param0, param1, ...] of a single QASM
+        operation, tokenized in the same way as in get_parallel_qasm_ops.
+        '''
+        tokens = self._token_re.findall(qasm_op)
+        if not tokens:
             raise ValueError("QASM operation cannot be empty")
-        return qasm_op.split()[0]
+        return tokens
+
+    @classmethod
+    def get_qasm_op_name(self, qasm_op):
+        return self.get_qasm_op_tokens(qasm_op)[0]
 
     @classmethod
     def get_qasm_op_params(self, qasm_op):
-        if qasm_op == '':
-            raise ValueError("QASM operation cannot be empty")
-        return qasm_op.split()[1:]
+        return self.get_qasm_op_tokens(qasm_op)[1:]
 
     def assign_timing_to_events(self):
         '''
@@ -603,40 +620,39 @@ class QASM_QuMIS_Compiler():
 
         The timing grid is defined in terms of clocks.
         '''
-        self.timing_grid = []
+        # Using local variables here is for optimization
+        op_meta = self._op_meta
+        WAIT = EventType.WAIT
+        get_max_duration = self.get_max_duration
+
+        # every line starts a new time point, the grid is allocated up front
+        timing_grid = [None] * len(self.timing_event_list)
 
-        for timing_events in self.timing_event_list:
-            # each line starts a new time point
+        for i, timing_events in enumerate(self.timing_event_list):
             # two thing to do for this time point:
             # 1. determine what happens at this moment
             # 2. determine the following waiting time
-            op_name = timing_events[0].name
-            tp = time_point(label=op_name)
-
-            # determine the following waiting time
-            if self.is_wait_line(timing_events):
-                timing_event = timing_events[0]
-                op_name = timing_event.name
-                if self.qasm_op_dict[op_name]["parameters"] == 1:
+            timing_event = timing_events[0]
+            op_name = timing_event.name
+
+            if timing_event.event_type is WAIT:
+                # nothing happens at this moment, only waiting
+                if op_meta[op_name][1] == 1:
                     following_waiting_time = timing_event.params[0]
                 elif op_name == "init_all":
                     following_waiting_time = self.init_time
                 else:
-                    se = SyntaxError("unsupported instruction ({})"
-                                     " found.".format(timing_event.name))
-                    se.filename = self.filename
-                    se.lineno = timing_event.line_number
-                    raise se
+                    raise self._syn("unsupported instruction ({})"
+                                    " found.".format(timing_event.name),
+                                    timing_event.line_number)
+                tp = time_point(op_name, -1, following_waiting_time)
             else:
-                following_waiting_time = self.get_max_duration(timing_events)
-
-            tp.following_waiting_time = following_waiting_time
-
-            # determine what happens at this moment
-            if self.is_wait_line(timing_events) is False:
+                tp = time_point(op_name, -1, get_max_duration(timing_events))
                 tp.parallel_events.extend(timing_events)
 
-            self.timing_grid.append(tp)
+            timing_grid[i] = tp
+
+        self.timing_grid = timing_grid
 
         self.get_absolute_timing()
 
@@ -645,67 +661,96 @@ class QASM_QuMIS_Compiler():
             self.print_timing_grid()
 
     def resolve_qubit_name(self):
-        self.build_qubit_map()
-        self.map_qubits()
+        q_op_events = self.build_qubit_map()
+        self.map_qubits(q_op_events)
         if self.verbosity_level > 4:
             print("End of resolving qubit name:")
             self.print_timing_events()
 
     def build_qubit_map(self):
+        '''
+        Builds the qubit map from the DECLARE and MAP events and collects
+        the remaining events into timing_event_list in a single pass over
+        raw_event_list. Returns the quantum operation events, whose declared
+        qubits are mapped to physical qubits by map_qubits.
+        '''
         self.declared_qubits = []
-        i = 0
-        while i < len(self.raw_event_list):
-            raw_events = self.raw_event_list[i]
-            for raw_event in raw_events:
-                if (raw_event.event_type == EventType.DECLARE):
-                    self.extend_dec_qubit_list(raw_event)
-                    self.raw_event_list.pop(i)
-                elif (raw_event.event_type == EventType.MAP):
-                    if not self.qubit_map_from_config:
-                        self.add_qubit_map(raw_event)
-                    self.raw_event_list.pop(i)
-                else:
-                    i = i + 1
-        if len(self.qubit_map) == 0:
-            se = SyntaxError("Qubit map not found in the QASM file.")
-            se.filename = self.filename
-            raise se
-
-        if (self.verbosity_level > 4):
-            print("End of building qubit map:")
-            self.print_raw_events()
-
-    def map_qubits(self):
+        self._declared_qubits_set = set()
+        # DECLARE and MAP events are handled here, a MAP in the program is
+        # ignored if the qubit map is specified in the config.
+        handlers = {
+            EventType.DECLARE: self.extend_dec_qubit_list,
+            EventType.MAP: (self._ignore_event if self.qubit_map_from_config
+                            else self.add_qubit_map)}
+        # Using local variables here is for optimization
+        WAIT = EventType.WAIT
+
+        # DECLARE and MAP events occupy a line of their own, lines that only
+        # contain these do not end up in the timing event list.
         self.timing_event_list = []
+        q_op_events = []
         for raw_events in self.raw_event_list:
             timing_events = []
             for raw_event in raw_events:
-                if (raw_event.event_type == EventType.WAIT):
+                event_type = raw_event.event_type
+                if event_type is WAIT:
                     timing_events.append(raw_event)
-                if self.is_q_op_event(raw_event):
-                    params = [self.qubit_map[dec_qubit]
-                              for dec_qubit in raw_event.params]
-                    raw_event.params = params
+                elif event_type in q_op_types:
                     timing_events.append(raw_event)
-            self.timing_event_list.append(timing_events)
+                    q_op_events.append(raw_event)
+                else:
+                    handler = handlers.get(event_type)
+                    if handler is not None:
+                        handler(raw_event)
+            if timing_events:
+                self.timing_event_list.append(timing_events)
+
+        if len(self.qubit_map) == 0:
+            raise self._syn("Qubit map not found in the QASM file.")
+
+        return q_op_events
+
+    @classmethod
+    def _ignore_event(self, raw_event):
+        pass
+
+    def map_qubits(self, q_op_events=None):
+        '''
+        Maps the declared qubits in the parameters of q_op_events to the
+        physical qubits in the qubit map. If q_op_events is not given, the
+        quantum operations in timing_event_list are mapped.
+        '''
+        if q_op_events is None:
+            q_op_events = [raw_event for timing_events in
+                           self.timing_event_list
+                           for raw_event in timing_events
+                           if raw_event.event_type in q_op_types]
+        # check all qubits at once so that the mapping below cannot fail
+        used_qubits = {q for raw_event in q_op_events
+                       for q in raw_event.params}
+        unmapped_qubits = used_qubits - self.qubit_map.keys()
+        if unmapped_qubits:
+            raise self._syn("qubit(s) {} not found in the qubit map.".format(
+                sorted(unmapped_qubits)))
+
+        qmap_get = self.qubit_map.__getitem__
+        for raw_event in q_op_events:
+            raw_event.params = list(map(qmap_get, raw_event.params))
 
     def extend_dec_qubit_list(self, raw_event):
         for q in raw_event.params:
-            if self.declared_qubits.count(q):
-                se = SyntaxError("Redefinition of {}".format(q))
-                se.filename = self.filename
-                se.lineno = raw_event.line_number
-                raise se
+            if q in self._declared_qubits_set:
+                raise self._syn("Redefinition of {}".format(q),
+                                raw_event.line_number)
             else:
                 self.declared_qubits.append(q)
+                self._declared_qubits_set.add(q)
 
         if (len(self.declared_qubits) > len(self.physical_qubits)):
-            se = SyntaxError("More qubits declared ({}) than available phys"
-                             "ical qubits ({}).".format(
-                                 len(self.declared_qubits),
-                                 len(self.physical_qubits)))
-            se.filename = self.filename
-            raise se
+            raise self._syn("More qubits declared ({}) than available phys"
+                            "ical qubits ({}).".format(
+                                len(self.declared_qubits),
+                                len(self.physical_qubits)))
         if self.verbosity_level >= 3:
             print("Extend declared qubit list:")
             print("\tDeclared qubits: {}".format(self.declared_qubits))
@@ -714,33 +759,24 @@ class QASM_QuMIS_Compiler():
     def add_qubit_map(self, raw_event):
         dec_qubit, phys_qubit = raw_event.params
 
-        if (dec_qubit not in self.declared_qubits):
-            se = SyntaxError("undefined qubit ({}) found.".format(dec_qubit))
-            se.filename = self.filename
-            se.lineno = raw_event.line_number
-            raise se
+        if (dec_qubit not in self._declared_qubits_set):
+            raise self._syn("undefined qubit ({}) found.".format(dec_qubit),
+                            raw_event.line_number)
 
         if (dec_qubit in self.qubit_map):
-            se = SyntaxError("remapping of the qubit {}.".format(dec_qubit))
-            se.filename = self.filename
-            se.lineno = raw_event.line_number
-            raise se
+            raise self._syn("remapping of the qubit {}.".format(dec_qubit),
+                            raw_event.line_number)
 
         if (is_int(phys_qubit) is False):
-            se = SyntaxError("the target qubit ({}) is not"
-                             " an integer.".format(phys_qubit))
-            se.filename = self.filename
-            se.lineno = raw_event.line_number
-            raise se
+            raise self._syn("the target qubit ({}) is not"
+                            " an integer.".format(phys_qubit),
+                            raw_event.line_number)
 
         phys_qubit = int(phys_qubit)
 
         if (phys_qubit not in self.physical_qubits):
-            se = SyntaxError("physical qubit ({}) is not available.".format(
-                phys_qubit))
-            se.filename = self.filename
-            se.lineno = raw_event.line_number
-            raise se
+            raise self._syn("physical qubit ({}) is not available.".format(
+                phys_qubit), raw_event.line_number)
 
         self.qubit_map[dec_qubit] = int(phys_qubit)
 
@@ -769,14 +805,9 @@ class QASM_QuMIS_Compiler():
         '''
         new_event_list = []
         for param in event.params:
-            new_event = qasm_event()
-            new_event.line_number = event.line_number
-            new_event.event_type = event.event_type
-            new_event.name = event.name
-            new_event.params = [param]
-            new_event.duration = event.duration
-            new_event.channel_latency = event.channel_latency
-            new_event_list.append(new_event)
+            new_event_list.append(qasm_event(
+                event.line_number, event.event_type, event.name, [param],
+                event.duration, event.channel_latency))
 
         return new_event_list
 
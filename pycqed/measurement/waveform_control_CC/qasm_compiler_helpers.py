@@ -1,4 +1,5 @@
 import enum
+import re
 import sys
 import logging
 import copy
@@ -98,7 +99,19 @@ def get_timepoints_from_label(
     return timepoints
 
 
+# strings accepted by int() and float() (including underscores between
+# digits), used to validate strings without raising and catching an
+# exception for every rejected value.
+_digits = r'\d+(?:_\d+)*'
+_int_re = re.compile(r'\s*[+-]?{0}\s*'.format(_digits))
+_number_re = re.compile(
+    r'\s*[+-]?(({0}(\.({0})?)?|\.{0})([eE][+-]?{0})?|inf(inity)?|nan)\s*'
+    .format(_digits), re.IGNORECASE)
+
+
 def is_number(s):
+    if isinstance(s, str):
+        return _number_re.fullmatch(s) is not None
     try:
         float(s)
         return True
@@ -107,6 +120,8 @@ def is_number(s):
 
 
 def is_int(s):
+    if isinstance(s, str):
+        return _int_re.fullmatch(s) is not None
     try:
         int(s)
         return True
@@ -243,6 +258,9 @@ class EventType(enum.Enum):
 
 
 class time_point():
+    __slots__ = ('label', 'absolute_time', 'following_waiting_time',
+                 'parallel_events')
+
     def __init__(self, label='', absolute_time=-1, following_waiting_time=-1):
         self.label = label
         self.absolute_time = absolute_time
@@ -258,14 +276,17 @@ class time_point():
 
 
 class qasm_event():
-
-    def __init__(self):
-        self.line_number = -1
-        self.event_type = EventType.NONE_EVENT
-        self.name = ''
-        self.params = None
-        self.duration = 0
-        self.channel_latency = 0
+    __slots__ = ('line_number', 'event_type', 'name', 'params', 'duration',
+                 'channel_latency')
+
+    def __init__(self, line_number=-1, event_type=EventType.NONE_EVENT,
+                 name='', params=None, duration=0, channel_latency=0):
+        self.line_number = line_number
+        self.event_type = event_type
+        self.name = name
+        self.params = params
+        self.duration = duration
+        self.channel_latency = channel_latency
 
     def __repr__(self):
         base_str = ('qasm_event({}, params={}, duration={})')
@@ -311,6 +332,7 @@ class qumis_event():
 
 
 class prog_line():
+    __slots__ = ('number', 'content')
 
     def __init__(self, number=-1, content=''):
         self.number = number
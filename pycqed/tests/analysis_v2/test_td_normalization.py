@@ -0,0 +1,96 @@
+import unittest
+import numpy as np
+from pycqed.analysis import analysis_toolbox as a_tools
+from pycqed.analysis_v2 import _td_numba as tdn
+from pycqed.analysis_v2 import timedomain_analysis as tda
+
+
+@unittest.skipIf(not tdn.NUMBA_AVAILABLE, 'numba is not installed')
+class Test_td_numba_kernels(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(self):
+        rng = np.random.RandomState(0)
+        self.y = rng.normal(size=42)
+        self.iq = rng.normal(size=(2, 42))
+        self.cal_zero = [-4, -3]
+        self.cal_one = [-2, -1]
+
+    def test_normalize_v3(self):
+        ref = a_tools.normalize_data_v3(self.y,
+                                        cal_zero_points=self.cal_zero,
+                                        cal_one_points=self.cal_one)
+        corr_data = tdn._normalize_v3(
+            self.y, np.array(self.cal_zero), np.array(self.cal_one))
+        np.testing.assert_array_almost_equal(corr_data, ref)
+
+    def test_rotate_and_normalize(self):
+        ref, zero_coord, one_coord = a_tools.rotate_and_normalize_data(
+            data=self.iq, cal_zero_points=self.cal_zero,
+            cal_one_points=self.cal_one)
+        corr_data, I_zero, Q_zero, I_one, Q_one = tdn._rotate_and_normalize(
+            self.iq, np.array(self.cal_zero), np.array(self.cal_one))
+        np.testing.assert_array_almost_equal(corr_data, ref)
+        np.testing.assert_array_almost_equal((I_zero, Q_zero), zero_coord)
+        np.testing.assert_array_almost_equal((I_one, Q_one), one_coord)
+
+
+class Test_numpy_normalization(unittest.TestCase):
+
+    def test_normalize_fast(self):
+        rng = np.random.RandomState(0)
+        y = rng.normal(size=42)
+        ref = a_tools.normalize_data_v3(y, cal_zero_points=[-4, -3],
+                                        cal_one_points=[-2, -1])
+        corr_data = tda._normalize_fast(
+            y, np.array([-4, -3]), np.array([-2, -1]))
+        np.testing.assert_array_almost_equal(corr_data, ref)
+
+    def test_rotate_and_normalize_fast(self):
+        rng = np.random.RandomState(0)
+        iq = rng.normal(size=(2, 42))
+        ref, zero_coord, one_coord = a_tools.rotate_and_normalize_data(
+            data=iq, cal_zero_points=[-4, -3], cal_one_points=[-2, -1])
+        corr_data, zc, oc = tda._rotate_and_normalize_fast(
+            iq, np.array([-4, -3]), np.array([-2, -1]))
+        np.testing.assert_array_almost_equal(corr_data, ref)
+        np.testing.assert_array_almost_equal(zc, zero_coord)
+        np.testing.assert_array_almost_equal(oc, one_coord)
+
+
+class Test_Single_Qubit_TimeDomainAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.iq = rng.normal(size=(2, 42))
+        # process_data only needs the options and the raw data, not the
+        # files read by extract_data
+        self.a = tda.Single_Qubit_TimeDomainAnalysis.__new__(
+            tda.Single_Qubit_TimeDomainAnalysis)
+        self.a.options_dict = {}
+        self.a.raw_data_dict = {'measured_values': self.iq}
+        self.a.proc_data_dict = {}
+
+    def test_default_cal_points(self):
+        ref, _, _ = a_tools.rotate_and_normalize_data(
+            data=self.iq, cal_zero_points=[-4, -3], cal_one_points=[-2, -1])
+        self.a.process_data()
+        np.testing.assert_array_almost_equal(
+            self.a.proc_data_dict['corr_data'], ref)
+
+    def test_cal_points_changed_after_processing(self):
+        self.a.process_data()
+        self.a.options_dict['cal_points'] = [[0, 1], [2, 3]]
+        self.a.process_data()
+        ref, _, _ = a_tools.rotate_and_normalize_data(
+            data=self.iq, cal_zero_points=[0, 1], cal_one_points=[2, 3])
+        np.testing.assert_array_almost_equal(
+            self.a.proc_data_dict['corr_data'], ref)
+
+    def test_only_zero_cal_points(self):
+        self.a.options_dict['cal_points'] = [[-2, -1], None]
+        ref, _, _ = a_tools.rotate_and_normalize_data(
+            data=self.iq, cal_zero_points=[-2, -1], cal_one_points=None)
+        self.a.process_data()
+        np.testing.assert_array_almost_equal(
+            self.a.proc_data_dict['corr_data'], ref)
@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+from pycqed.measurement.pulse_sequences import multi_qubit_tek_seq_elts as mqs
+
+
+class Test_kernel_loading(unittest.TestCase):
+
+    def setUp(self):
+        self.kernel_dir = mqs.kernel_dir
+        mqs.kernel_dir = tempfile.mkdtemp() + os.sep
+        mqs.clear_kernel_caches()
+        self.txt_fn = mqs.kernel_dir + 'kernel.txt'
+        self.npy_fn = mqs.kernel_dir + 'kernel.npy'
+
+    def tearDown(self):
+        shutil.rmtree(mqs.kernel_dir)
+        mqs.kernel_dir = self.kernel_dir
+        mqs.clear_kernel_caches()
+
+    def write_txt(self, kernel, mtime):
+        np.savetxt(self.txt_fn, kernel)
+        os.utime(self.txt_fn, (mtime, mtime))
+
+    def test_newer_npy_is_used(self):
+        self.write_txt([1, .5], mtime=1000)
+        np.save(self.npy_fn, np.array([2, .5]))
+        os.utime(self.npy_fn, (2000, 2000))
+        kernel = mqs.load_kernel('kernel.txt')
+        np.testing.assert_array_equal(kernel, [2, .5])
+        self.assertEqual(kernel.dtype, np.float32)
+
+    def test_rewritten_txt_is_reparsed(self):
+        self.write_txt([1, .5], mtime=1000)
+        mqs.convert_kernel_to_npy('kernel.txt')
+        os.utime(self.npy_fn, (2000, 2000))
+        np.testing.assert_array_equal(mqs.load_kernel('kernel.txt'), [1, .5])
+
+        self.write_txt([1, .25], mtime=3000)
+        kernel = mqs.load_kernel('kernel.txt')
+        np.testing.assert_array_equal(kernel, [1, .25])
+        self.assertEqual(kernel.dtype, np.float32)
+
+    def test_npy_only(self):
+        np.save(self.npy_fn, np.array([1, .5, .25]))
+        kernel = mqs.load_kernel('kernel.txt')
+        np.testing.assert_array_equal(kernel, [1, .5, .25])
+        self.assertEqual(kernel.dtype, np.float32)
+
+    def test_preloaded_kernels_reloaded_after_clear(self):
+        distortion_dict = {'ch_list': ['ch3'], 'ch3': ['kernel.txt', '']}
+        self.write_txt([1, .5], mtime=1000)
+        kernels = mqs.preload_kernels_func(distortion_dict)
+        np.testing.assert_array_equal(kernels['ch3'][0], [1, .5])
+
+        self.write_txt([1, .25], mtime=2000)
+        kernels = mqs.preload_kernels_func(distortion_dict)
+        np.testing.assert_array_equal(kernels['ch3'][0], [1, .5])
+
+        mqs.clear_kernel_caches()
+        kernels = mqs.preload_kernels_func(distortion_dict)
+        np.testing.assert_array_equal(kernels['ch3'][0], [1, .25])
@@ -3,6 +3,8 @@ This module contains tests for the QASM compiler by Xiang Fu
 """
 import unittest
 import sys
+import shutil
+import tempfile
 import numpy as np
 import pycqed as pq
 from io import StringIO
@@ -21,6 +23,8 @@ from pycqed.measurement.waveform_control_CC import \
 
 from pycqed.measurement.waveform_control_CC.qasm_compiler_helpers import \
     get_timepoints_from_label
+from pycqed.measurement.waveform_control_CC.qasm_config_gen import \
+    create_config
 
 
 class Test_compiler(unittest.TestCase):
@@ -483,6 +487,58 @@ class Test_multi_qubit_seqs(unittest.TestCase):
         compiler.timing_event_list
 
 
+class Test_compiler_snippets(unittest.TestCase):
+    '''
+    Compiles small QASM programs against the config of qasm_config_gen,
+    these do not depend on the files in qasm_files.
+    '''
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.config = create_config()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def compile_snippet(self, qasm):
+        qasm_fn = join(self.tmp_dir, 'snippet.qasm')
+        with open(qasm_fn, 'w') as f:
+            f.write(qasm)
+        compiler = qcx.QASM_QuMIS_Compiler(verbosity_level=0)
+        compiler.compile(qasm_fn, join(self.tmp_dir, 'snippet.qumis'),
+                         config=self.config)
+        return compiler
+
+    def test_declare_after_parallel_line(self):
+        # the line following a line with parallel operations used to be
+        # skipped when building the qubit map
+        compiler = self.compile_snippet(
+            "qubit ql\nx90 ql | y90 qr\nqubit qr\nx90 qr\n")
+        self.assertIn('qr', compiler.declared_qubits)
+        self.assertEqual(len(compiler.timing_event_list), 2)
+        for timing_events in compiler.timing_event_list:
+            self.assertNotEqual(len(timing_events), 0)
+
+    def test_unmapped_qubit(self):
+        with self.assertRaisesRegex(SyntaxError,
+                                    'not found in the qubit map'):
+            self.compile_snippet("qubit ql, qx\nx90 qx\n")
+
+    def test_negative_wait(self):
+        # idx takes the waiting time in ns, -5 ns is -1 cycle
+        with self.assertRaisesRegex(ValueError, 'parameter -1 on line 2 '):
+            self.compile_snippet("qubit ql, qr\nidx -5\n")
+
+    def test_build_and_map_qubits(self):
+        compiler = self.compile_snippet("qubit ql, qr\nx90 ql | y90 qr\n")
+        compiler.line_to_event()
+        compiler.build_qubit_map()
+        compiler.map_qubits()
+        params = [event.params for timing_events in
+                  compiler.timing_event_list for event in timing_events]
+        self.assertEqual(params, [[0], [1]])
+
+
 class Capturing(list):
 
     def __enter__(self):
@@ -0,0 +1,45 @@
+import unittest
+from types import SimpleNamespace
+
+from pycqed.measurement.waveform_control import sequence
+
+
+class Test_Sequence(unittest.TestCase):
+
+    def setUp(self):
+        # the sequence only refers to elements by name
+        self.elements = [SimpleNamespace(name='elt_{}'.format(i))
+                         for i in range(5)]
+
+    def test_extend_elements_equals_append_element(self):
+        kw = {'repetitions': 3, 'goto_target': 'elt_0',
+              'jump_target': 'elt_2', 'trigger_wait': True}
+        seq_appended = sequence.Sequence('appended')
+        for el in self.elements:
+            seq_appended.append_element(el, **kw)
+        seq_extended = sequence.Sequence('extended')
+        seq_extended.extend_elements(self.elements, **kw)
+        self.assertEqual(seq_extended.elements, seq_appended.elements)
+
+        # default arguments
+        seq_appended = sequence.Sequence('appended')
+        for el in self.elements:
+            seq_appended.append_element(el)
+        seq_extended = sequence.Sequence('extended')
+        seq_extended.extend_elements(self.elements)
+        self.assertEqual(seq_extended.elements, seq_appended.elements)
+
+    def test_extend_elements_duplicate_in_batch(self):
+        seq = sequence.Sequence('seq')
+        seq.append_element(SimpleNamespace(name='first'))
+        with self.assertRaises(KeyError):
+            seq.extend_elements(self.elements + [self.elements[1]])
+        self.assertEqual([elt['name'] for elt in seq.elements], ['first'])
+
+    def test_extend_elements_name_already_present(self):
+        seq = sequence.Sequence('seq')
+        seq.extend_elements(self.elements[:2])
+        with self.assertRaises(KeyError):
+            seq.extend_elements(self.elements[2:] + self.elements[:1])
+        self.assertEqual([elt['name'] for elt in seq.elements],
+                         ['elt_0', 'elt_1'])
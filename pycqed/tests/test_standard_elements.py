@@ -0,0 +1,64 @@
+import unittest
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+from pycqed.measurement.pulse_sequences import standard_elements as st_elts
+
+
+class Test_distortions(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.wf = rng.uniform(-.5, .5, 1000)
+        self.kernels = [rng.uniform(-.1, 1, 301).astype(np.float32),
+                        rng.uniform(-.1, 1, 50).astype(np.float32)]
+        self.distortion_dict = {'ch_list': ['ch3'], 'ch3': self.kernels[0]}
+
+    def tearDown(self):
+        st_elts.clear_kernel_rfft_cache()
+
+    def test_distort_wf(self):
+        distorted_wf = st_elts._distort_wf(self.wf, 'ch3',
+                                           self.distortion_dict)
+        np.testing.assert_allclose(
+            distorted_wf, np.convolve(self.wf, self.kernels[0])[:1000],
+            atol=1e-9)
+
+    def test_distort_wf_preloaded_kernels(self):
+        expected_wf = self.wf
+        for kernelvec in self.kernels:
+            expected_wf = np.convolve(expected_wf, kernelvec)[:len(self.wf)]
+        preloaded_kernels = {'ch3': self.kernels}
+        for i in range(2):
+            # the second time the cached spectra of the kernels are used
+            distorted_wf = st_elts._distort_wf(
+                self.wf, 'ch3', self.distortion_dict, preloaded_kernels)
+            self.assertEqual(distorted_wf.shape, self.wf.shape)
+            self.assertEqual(distorted_wf.dtype, self.wf.dtype)
+            # the preloaded kernels are transformed in single precision
+            np.testing.assert_allclose(distorted_wf, expected_wf, atol=1e-3)
+
+    def test_distort_wf_no_preloaded_kernels(self):
+        distorted_wf = st_elts._distort_wf(self.wf, 'ch3',
+                                           self.distortion_dict, {'ch3': []})
+        np.testing.assert_array_equal(distorted_wf, self.wf)
+
+    def test_kernel_rfft(self):
+        kernelvec = self.kernels[1]
+        spectrum = st_elts._kernel_rfft(kernelvec, 128)
+        np.testing.assert_allclose(spectrum, np.fft.rfft(kernelvec, 128))
+        self.assertIs(st_elts._kernel_rfft(kernelvec, 128), spectrum)
+        self.assertEqual(len(st_elts._kernel_rfft(kernelvec, 256)), 129)
+
+    def test_kernel_rfft_threads(self):
+        # more (kernel, n) pairs than fit in the cache, used concurrently
+        # like by the channels in distort_and_compensate
+        def transform(n):
+            return [st_elts._kernel_rfft(k, n) for k in self.kernels]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            spectra = list(executor.map(transform, range(400, 600)))
+        for n, (spec0, spec1) in zip(range(400, 600), spectra):
+            self.assertEqual(len(spec0), n//2 + 1)
+            self.assertEqual(len(spec1), n//2 + 1)
+        self.assertLessEqual(len(st_elts._kernel_rfft_cache),
+                             st_elts._KERNEL_RFFT_CACHE_SIZE)
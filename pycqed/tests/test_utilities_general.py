@@ -2,7 +2,9 @@ import numpy as np
 import time
 from pytest import approx
 from lmfit.parameter import Parameter
-from pycqed.utilities.general import SafeFormatter, format_value_string, ramp_values
+from concurrent.futures import ThreadPoolExecutor
+from pycqed.utilities.general import SafeFormatter, format_value_string, ramp_values, \
+    LRUCache
 
 
 base_str = 'my_test_values_{:.2f}_{:.3f}'
@@ -120,3 +122,30 @@ def test_ramp_values_close():
                 callable=x.append)
     assert x == approx([-0.01251])
     dt = time.time() - t0
+
+
+def test_lru_cache():
+    cache = LRUCache(2)
+    cache['a'] = 1
+    cache['b'] = 2
+    assert cache.get('a') == 1
+    # 'b' is now the least recently used entry
+    cache['c'] = 3
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_lru_cache_threads():
+    cache = LRUCache(32)
+
+    def use_cache(i):
+        for key in range(i, i + 200):
+            if cache.get(key) is None:
+                cache[key] = key
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(use_cache, range(16)))
+    assert len(cache) == 32
@@ -1,5 +1,6 @@
 import time
-from collections import MutableMapping
+import threading
+from collections import MutableMapping, OrderedDict
 import os
 import sys
 import numpy as np
@@ -514,6 +515,39 @@ class NumpyJsonEncoder(json.JSONEncoder):
             return super().default(o)
 
 
+class LRUCache:
+    '''
+    Cache that keeps the maxsize most recently used entries. Getting and
+    setting entries is thread safe.
+    '''
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
 class suppress_stdout(ContextDecorator):
     '''
     A context manager for doing a "deep suppression" of stdout and stderr in